@@ -1,33 +1,63 @@
+import functools
 import logging
 import os
 import re
+import threading
 
+from collections.abc import Iterable
+from collections.abc import Iterator
 from pathlib import Path
+from typing import Callable
 
-import sqlglot
+from sqlglot import Dialect
+from sqlglot import Generator
+from sqlglot import Parser
+from sqlglot import Tokenizer
 
+from sqlecto.utils import iter_sql_statements
 from sqlecto.utils import read_file
 
 
 logger = logging.getLogger(__name__)
 
+_SPARK_SQL_RE = re.compile(
+    r'spark\.sql\(\s*f?(?P<quote>\'{3}|"{3})(?P<body>.*?)(?P=quote)\s*\)', re.DOTALL
+)
 
-def filter_create_table_queries(queries: list[str]) -> list[str]:
+_CREATE_TABLE_RE = re.compile(r"\s*CREATE\s+TABLE\b", re.IGNORECASE)
+_CREATE_TABLE_BYTES_RE = re.compile(rb"\s*CREATE\s+TABLE\b", re.IGNORECASE)
+
+_QUERY_SEPARATOR = ";\n\n\n" + "-" * 80 + "\n\n"
+_OUTPUT_BUFFER_SIZE = 1 << 20
+
+_thread_local = threading.local()
+
+
+def filter_create_table_queries(queries: Iterable[str]) -> list[str]:
     """
     Filters out SQL queries that start with 'CREATE TABLE'.
 
     Args:
-        queries (list[str]): A list of SQL queries.
+        queries (Iterable[str]): The SQL queries, possibly produced lazily.
 
     Returns:
         list[str]: A list of SQL queries that do not start with 'CREATE TABLE'.
     """
-    filtered_queries = [
-        query
-        for query in queries
-        if not query.strip().upper().startswith("CREATE TABLE")
-    ]
-    return filtered_queries
+    return [query for query in queries if not _CREATE_TABLE_RE.match(query)]
+
+
+def _iter_spark_queries(code: str) -> Iterator[str]:
+    """
+    Lazily yields the SQL queries passed to `spark.sql` in the given Python code.
+
+    Args:
+        code (str): The Python code containing SQL queries.
+
+    Returns:
+        Iterator[str]: The SQL queries, in order of appearance.
+    """
+    for match in _SPARK_SQL_RE.finditer(code):
+        yield match.group("body").strip()
 
 
 def extract_spark_queries(code: str) -> list[str]:
@@ -35,22 +65,12 @@ def extract_spark_queries(code: str) -> list[str]:
     Extracts SQL queries from the given Python code.
 
     Args:
-        python_code (str): The Python code containing SQL queries.
+        code (str): The Python code containing SQL queries.
 
     Returns:
         list[str]: A list of SQL queries extracted from the Python code.
     """
-    pattern = re.compile(r'spark\.sql\(\s*f?[\'"]{3}.*?[\'"]{3}\s*\)', re.DOTALL)
-    matches = pattern.findall(code)
-    queries = []
-
-    for match in matches:
-        m = re.search(r'[\'"]{3}.*?[\'"]{3}', match, re.DOTALL)
-        if m:
-            queries.append(m.group(0)[3:-3].strip())
-        else:
-            logger.warning(f"Could not extract SQL query from: {match}")
-    return queries
+    return list(_iter_spark_queries(code))
 
 
 def extract_sql_queries(content: str) -> list[str]:
@@ -67,6 +87,57 @@ def extract_sql_queries(content: str) -> list[str]:
     return [query.strip() for query in queries if query.strip()]
 
 
+def make_replacer(mappings: list[dict]) -> Callable[[str], str]:
+    """
+    Builds a function that replaces table names in a single SQL query.
+
+    Only whole identifiers are replaced, so a mapping for ``orders`` leaves
+    ``orders_archive`` untouched. When a source table is mapped more than once,
+    the first mapping wins. The function is compiled once per distinct set of
+    mappings and reused for every later file.
+
+    Args:
+        mappings (list[dict]): A list of mappings from source to target tables.
+
+    Returns:
+        Callable[[str], str]: A function returning the query with replaced names.
+    """
+    return _compile_replacer(
+        tuple((mapping["src_table"], mapping["dst_table"]) for mapping in mappings)
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _compile_replacer(pairs: tuple[tuple[str, str], ...]) -> Callable[[str], str]:
+    """
+    Compiles the table name replacement function for `make_replacer`.
+
+    Args:
+        pairs (tuple): The (source table, target table) pairs, in priority order.
+
+    Returns:
+        Callable[[str], str]: A function returning the query with replaced names.
+    """
+    if not pairs:
+        return lambda query: query
+
+    replacements: dict[str, str] = {}
+    for src_table, dst_table in pairs:
+        replacements.setdefault(src_table, dst_table)
+
+    # Longest names first so "db.table" wins over its "db" prefix.
+    alternation = "|".join(
+        re.escape(src_table)
+        for src_table in sorted(replacements, key=len, reverse=True)
+    )
+    table_re = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)")
+
+    def replace(match: re.Match) -> str:
+        return replacements[match.group(0)]
+
+    return functools.partial(table_re.sub, replace)
+
+
 def replace_table_names(queries: list[str], mappings: list[dict]) -> list[str]:
     """
     Replaces table names in SQL queries based on the provided mappings.
@@ -78,34 +149,95 @@ def replace_table_names(queries: list[str], mappings: list[dict]) -> list[str]:
     Returns:
         list[str]: A list of SQL queries with replaced table names.
     """
-    for mapping in mappings:
-        src_table = mapping["src_table"]
-        dst_table = mapping["dst_table"]
-        queries = [query.replace(src_table, dst_table) for query in queries]
-    return queries
+    replace = make_replacer(mappings)
+    return [replace(query) for query in queries]
+
+
+def _get_transpiler(read: str, write: str) -> tuple[Tokenizer, Parser, Generator]:
+    """
+    Returns the tokenizer, parser and generator used for a dialect pair.
+
+    These objects keep per-call state, so each thread builds and reuses its own
+    set instead of sharing one across threads.
+
+    Args:
+        read (str): The source SQL dialect.
+        write (str): The target SQL dialect.
+
+    Returns:
+        tuple: The source dialect tokenizer and parser, and the target generator.
+    """
+    transpilers = getattr(_thread_local, "transpilers", None)
+    if transpilers is None:
+        transpilers = _thread_local.transpilers = {}
+    transpiler = transpilers.get((read, write))
+    if transpiler is None:
+        read_dialect = Dialect.get_or_raise(read)
+        write_dialect = Dialect.get_or_raise(write)
+        transpiler = transpilers[(read, write)] = (
+            read_dialect.tokenizer,
+            read_dialect.parser(),
+            write_dialect.generator(pretty=True),
+        )
+    return transpiler
+
+
+@functools.lru_cache(maxsize=2048)
+def _transpile_one(query: str, read: str, write: str) -> str:
+    """
+    Transpiles a single SQL query, memoizing the result.
+
+    Repeated statements across files skip the parse/generate pipeline entirely.
+
+    Args:
+        query (str): The SQL query to be transpiled.
+        read (str): The source SQL dialect.
+        write (str): The target SQL dialect.
+
+    Returns:
+        str: The transpiled SQL query.
+    """
+    tokenizer, parser, generator = _get_transpiler(read, write)
+    expression = parser.parse(tokenizer.tokenize(query), query)[0]
+    return generator.generate(expression, copy=False) if expression else ""
+
+
+def _transpile_or_comment(query: str, src_dialect: str, dst_dialect: str) -> str:
+    """
+    Transpiles a single SQL query, falling back to a commented-out error.
+
+    Args:
+        query (str): The SQL query to be transpiled.
+        src_dialect (str): The source SQL dialect.
+        dst_dialect (str): The target SQL dialect.
+
+    Returns:
+        str: The transpiled query, or the original query prefixed by the error.
+    """
+    try:
+        return _transpile_one(query, src_dialect, dst_dialect)
+    except Exception as e:
+        logger.error(f"Error transpiling query: {query}\nError: {e}")
+        return f"-- Error transpiling query:\n-- {e}\n{query}"
 
 
 def transpile_sql_queries(queries: list[str], src_dialect: str, dst_dialect) -> list:
     """
     Transpiles a list of SQL queries from Spark.
 
+    Each distinct query is transpiled once and its result reused for repeats.
+
     Args:
         queries (list[str]): A list of SQL queries to be transpiled.
         src_dialect (str): A dialect of SQL source query.
     Returns:
         list: A list of transpiled SQL queries.
     """
-    transpiled_queries = []
-    for query in queries:
-        try:
-            transpiled_query = sqlglot.transpile(
-                query, read=f"{src_dialect}", write=dst_dialect, pretty=True
-            )[0]
-            transpiled_queries.append(transpiled_query)
-        except Exception as e:
-            logger.error(f"Error transpiling query: {query}\nError: {e}")
-            transpiled_queries.append(f"-- Error transpiling query:\n-- {e}\n{query}")
-    return transpiled_queries
+    transpiled = {
+        query: _transpile_or_comment(query, src_dialect, dst_dialect)
+        for query in dict.fromkeys(queries)
+    }
+    return [transpiled[query] for query in queries]
 
 
 def process_file(
@@ -123,37 +255,45 @@ def process_file(
         src_dialect (str): The source SQL dialect.
         tgt_dialect (str): The target SQL dialect.
         table_mappings (list[dict]): A list of table name mappings.
+        output_dir (str): An existing directory to write the converted file to.
 
     Returns:
         Output file paths.
     """
-    content = read_file(file_path)
-
     if str(file_path).endswith(".py"):
-        all_queries = extract_spark_queries(content)
+        all_queries = _iter_spark_queries(read_file(file_path))
     elif str(file_path).endswith(".sql"):
-        all_queries = extract_sql_queries(content)
+        all_queries = iter_sql_statements(file_path, exclude=_CREATE_TABLE_BYTES_RE)
     else:
         raise ValueError(
             "Unsupported file type. Only .py and .sql files are supported."
         )
 
-    queries = filter_create_table_queries(all_queries)
-
-    queries = replace_table_names(queries, table_mappings)
-
-    transpiled_queries = transpile_sql_queries(queries, src_dialect, tgt_dialect)
-
-    os.makedirs(output_dir, exist_ok=True)
+    replace = make_replacer(table_mappings)
 
     base_name = os.path.basename(file_path)
     name_without_ext = os.path.splitext(base_name)[0]
     output_file_name = f"converted_{name_without_ext}.sql"
     output_file_path = os.path.join(output_dir, output_file_name)
 
-    with open(output_file_path, "w", encoding="utf-8") as output_file:
-        for query in transpiled_queries:
-            output_file.write(query + ";\n\n")
-            output_file.write("\n" + "-" * 80 + "\n\n")
+    # Stream into a temporary file and only move it into place once every
+    # query has been written, so a failing input never leaves a partial file
+    # behind or clobbers the output of an earlier run.
+    temp_file_path = os.path.join(output_dir, f".{output_file_name}.{os.getpid()}.tmp")
+    try:
+        with open(
+            temp_file_path, "w", encoding="utf-8", buffering=_OUTPUT_BUFFER_SIZE
+        ) as output_file:
+            output_file.writelines(
+                _transpile_or_comment(replace(query), src_dialect, tgt_dialect)
+                + _QUERY_SEPARATOR
+                for query in all_queries
+                if not _CREATE_TABLE_RE.match(query)
+            )
+        os.replace(temp_file_path, output_file_path)
+    except BaseException:
+        if os.path.exists(temp_file_path):
+            os.unlink(temp_file_path)
+        raise
 
     return output_file_path
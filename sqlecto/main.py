@@ -1,9 +1,12 @@
+import functools
 import json
 import logging
-import os
 
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Annotated
+from typing import Callable
 from typing import Optional
 
 import typer
@@ -13,6 +16,7 @@ from rich.logging import RichHandler
 from rich.progress import track
 
 from sqlecto.converter import process_file
+from sqlecto.utils import iter_source_files
 from sqlecto.utils import load_config
 from sqlecto.utils import validate_dialect
 
@@ -34,7 +38,7 @@ def parse_table_mapping(value: list[str]) -> list[dict]:
     Parses a list of table mapping strings into a list of dictionaries.
 
     Each string in the input list should be in the format "src_table:dst_table".
-    The function splits each string by the colon character and creates a dictionary
+    The function splits each string on its first colon and creates a dictionary
     with keys "src_table" and "dst_table" corresponding to the source and destination
     table names, respectively.
 
@@ -45,11 +49,53 @@ def parse_table_mapping(value: list[str]) -> list[dict]:
         list[dict]: A list of dictionaries with keys "src_table" and "dst_table".
     """
     return [
-        {"src_table": mapping.split(":")[0], "dst_table": mapping.split(":")[1]}
-        for mapping in value
+        {"src_table": src_table, "dst_table": dst_table}
+        for src_table, dst_table in (mapping.split(":", 1) for mapping in value)
     ]
 
 
+def _process_file_safe(
+    file_path: str, **kwargs
+) -> tuple[str, Optional[str], Optional[str]]:
+    """
+    Runs `process_file`, capturing any error instead of raising it.
+
+    Args:
+        file_path (str): The path to the file.
+        **kwargs: Keyword arguments forwarded to `process_file`.
+
+    Returns:
+        tuple: The file path, the output file path and the error message, if any.
+    """
+    try:
+        return file_path, process_file(file_path, **kwargs), None
+    except Exception as e:
+        return file_path, None, str(e)
+
+
+def _process_files(
+    worker: Callable[[str], tuple], files: list, jobs: int
+) -> Iterator[tuple]:
+    """
+    Applies the worker to each file, in a process pool when `jobs` is above one.
+
+    Args:
+        worker (Callable): A picklable callable taking a single file path.
+        files (list): The files to process.
+        jobs (int): The number of worker processes.
+
+    Returns:
+        Iterator[tuple]: The worker results, in the order of `files`.
+    """
+    if jobs == 1:
+        yield from map(worker, files)
+        return
+
+    chunksize = max(1, len(files) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(worker, files, chunksize=chunksize)
+
+
 @app.command()
 def main(
     source_files: Annotated[
@@ -108,6 +154,15 @@ def main(
     output_dir: Annotated[
         Path, typer.Option(help="Directory to save the transpiled queries")
     ] = Path("transpiled_queries"),
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            help="Number of worker processes used to convert files",
+            min=1,
+        ),
+    ] = 1,
 ) -> None:
     if config_file:
         try:
@@ -157,37 +212,33 @@ def main(
 
     if source_files:
         files_to_process.extend(source_files)
-    elif source_dir != Path(".") or not source_files:
-        for root, _, files in os.walk(source_dir):
-            for file in files:
-                if file.endswith((".py", ".sql")):
-                    files_to_process.append(os.path.join(root, file))
     else:
-        logger.info(
-            "No source file or directory specified. Defaulting to current directory."
-        )
-        for root, _, files in os.walk("."):
-            for file in files:
-                if file.endswith((".py", ".sql")):
-                    files_to_process.append(os.path.join(root, file))
+        files_to_process.extend(iter_source_files(source_dir))
 
     if not files_to_process:
         raise typer.BadParameter("No files found to process.")
 
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    worker = functools.partial(
+        _process_file_safe,
+        src_dialect=source_dialect,
+        tgt_dialect=target_dialect,
+        table_mappings=final_table_mappings,
+        output_dir=output_dir,
+    )
+
     processed_files = []
 
-    for file_path in track(files_to_process, description="Processing files..."):
-        try:
-            output_file_path = process_file(
-                file_path,
-                source_dialect,
-                target_dialect,
-                final_table_mappings,
-                output_dir,
-            )
+    for file_path, output_file_path, error in track(
+        _process_files(worker, files_to_process, jobs),
+        total=len(files_to_process),
+        description="Processing files...",
+    ):
+        if error is None:
             processed_files.append(output_file_path)
-        except Exception as e:
-            logger.error(f"Error processing file: {file_path}\nError: {e}")
+        else:
+            logger.error(f"Error processing file: {file_path}\nError: {error}")
 
     console.print("\n[bold green]Processed files:[/bold green]")
 
@@ -1,49 +1,302 @@
-import json
+import copy
+import functools
+import mmap
 import os
+import re
+import sys
 
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-
-import yaml
+from stat import S_ISREG
+from types import MappingProxyType
+from typing import Optional
 
 from sqlglot import Dialect
 
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+_INTERN_MAX_LENGTH = 64
+
+
+def _read_bytes(file_path: Path) -> bytes:
+    """
+    Reads the raw contents of a file in a single unbuffered call.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Returns:
+        bytes: The contents of the file.
+    """
+    with open(file_path, "rb", buffering=0) as file:
+        return file.read()
+
+
+def _normalize_newlines(text: str) -> str:
+    """
+    Translates CRLF and CR line endings to LF, as text mode does.
+
+    Args:
+        text (str): The decoded text.
+
+    Returns:
+        str: The text with LF line endings only.
+    """
+    if "\r" not in text:
+        return text
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
 def read_file(file_path: Path) -> str:
     """
     Reads the contents of a file and returns it as a string.
 
+    The file is read in one unbuffered call, which sizes its buffer from the
+    file size, and decoded once. Line endings are normalized to LF as in text
+    mode.
+
     Args:
         file_path (str): The path to the file.
 
     Returns:
         str: The contents of the file as a string.
     """
-    with open(file_path, encoding="utf-8") as file:
-        return file.read()
+    return _normalize_newlines(_read_bytes(file_path).decode("utf-8"))
+
+
+def iter_sql_statements(
+    file_path: Path, exclude: Optional[re.Pattern] = None
+) -> Iterator[str]:
+    """
+    Lazily yields the ';'-separated statements of a SQL file.
+
+    The file is memory-mapped and scanned for ';' bytes, so only one statement
+    is decoded at a time instead of holding the whole file and all of its
+    split parts in memory. Statements matching `exclude` are dropped before
+    they are decoded, and line endings are normalized to LF as in text mode.
+
+    Args:
+        file_path (str): The path to the SQL file.
+        exclude (re.Pattern, optional): A bytes pattern matched at the start of
+            each raw statement; matching statements are skipped.
+
+    Returns:
+        Iterator[str]: The stripped, non-empty statements of the file.
+    """
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            size = len(mm)
+            while start < size:
+                end = mm.find(b";", start)
+                if end == -1:
+                    end = size
+                if exclude is None or not exclude.match(mm, start, end):
+                    statement = _normalize_newlines(
+                        mm[start:end].decode("utf-8").strip()
+                    )
+                    if statement:
+                        yield statement
+                start = end + 1
+
+
+def iter_source_files(directory: Path) -> Iterator[str]:
+    """
+    Recursively yields the SQL and Python files found under a directory.
+
+    Uses `os.scandir`, whose entries cache their file type, so no extra `stat`
+    call is made per file. Like `os.walk`, files come before those of
+    subdirectories, symlinked directories are not followed and unreadable
+    directories are skipped.
+
+    Args:
+        directory (str): The directory to search.
+
+    Returns:
+        Iterator[str]: The paths of the .py and .sql files.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError:
+        return
+
+    subdirectories = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+
+        if not is_dir:
+            if entry.name.endswith((".py", ".sql")):
+                yield entry.path
+            continue
+
+        try:
+            is_symlink = entry.is_symlink()
+        except OSError:
+            is_symlink = False
+        if not is_symlink:
+            subdirectories.append(entry.path)
+
+    for subdirectory in subdirectories:
+        yield from iter_source_files(subdirectory)
+
+
+def _load_json(content: bytes) -> dict:
+    """
+    Parses the contents of a JSON configuration file.
+
+    Args:
+        content (bytes): The raw configuration file contents.
+
+    Returns:
+        dict: The configuration dictionary.
+    """
+    return json_loads(content)
+
+
+@functools.cache
+def _yaml_loader() -> type:
+    """
+    Builds the YAML loader class used by `_load_yaml`.
+
+    The loader is libyaml's CSafeLoader when available, with short strings
+    interned so keys repeated across documents share a single object.
+
+    Returns:
+        type: The YAML loader class.
+    """
+    import yaml
+
+    base = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+    class InterningLoader(base):
+        def construct_yaml_str(self, node):
+            value = super().construct_yaml_str(node)
+            return sys.intern(value) if len(value) < _INTERN_MAX_LENGTH else value
+
+    InterningLoader.add_constructor(
+        "tag:yaml.org,2002:str", InterningLoader.construct_yaml_str
+    )
+    return InterningLoader
+
+
+def _load_yaml(content: bytes) -> dict:
+    """
+    Parses the contents of a YAML configuration file.
+
+    PyYAML is only imported here, so JSON-only runs never pay for it.
+
+    Args:
+        content (bytes): The raw configuration file contents.
+
+    Returns:
+        dict: The configuration dictionary.
+    """
+    import yaml
+
+    return yaml.load(content, Loader=_yaml_loader())
+
+
+_LOADERS = MappingProxyType(
+    {".json": _load_json, ".yaml": _load_yaml, ".yml": _load_yaml}
+)
+
+
+def _load_config(config_path: Path) -> dict:
+    """
+    Parses a JSON or YAML configuration file.
+
+    Args:
+        config_path (str): The path to the configuration file.
+
+    Returns:
+        dict: The configuration dictionary.
+    """
+    _, ext = os.path.splitext(config_path)
+    loader = _LOADERS.get(ext.lower())
+    if loader is None:
+        raise ValueError(
+            "Unsupported file type. Only .json, .yml, and .yaml files are supported."
+        )
+    return loader(_read_bytes(config_path))
+
+
+@functools.lru_cache(maxsize=128)
+def _load_config_cached(config_path: str, mtime_ns: int, size: int) -> dict:
+    """
+    Parses a configuration file, memoized on its path, mtime and size.
+
+    Args:
+        config_path (str): The path to the configuration file.
+        mtime_ns (int): The file modification time, in nanoseconds.
+        size (int): The file size, in bytes.
+
+    Returns:
+        dict: The configuration dictionary.
+    """
+    return _load_config(config_path)
 
 
 def load_config(config_path: Path) -> dict:
     """
     Load the configuration from a JSON or YAML file.
 
+    YAML is parsed with libyaml when available and JSON with orjson when it is
+    installed. Parsed files are cached until they change, and every call
+    returns its own copy of the cached configuration. Call
+    `load_config.cache_clear()` to drop all cached configurations.
+
     Args:
         config_path (str): The path to the configuration file.
 
     Returns:
         dict: The configuration dictionary.
     """
-    _, ext = os.path.splitext(config_path)
-    with open(config_path, encoding="utf-8") as file:
-        if ext.lower() in [".yml", ".yaml"]:
-            return yaml.safe_load(file)
-        elif ext.lower() == ".json":
-            return json.load(file)
-        else:
-            raise ValueError(
-                "Unsupported file type. Only .json, .yml, and .yaml files are supported."
-            )
+    try:
+        stat = os.stat(config_path)
+    except OSError:
+        return _load_config(config_path)
+    if not S_ISREG(stat.st_mode):
+        return _load_config(config_path)
+    return copy.deepcopy(
+        _load_config_cached(os.fspath(config_path), stat.st_mtime_ns, stat.st_size)
+    )
+
+
+load_config.cache_clear = _load_config_cached.cache_clear  # type: ignore[attr-defined]
+
+
+def load_configs(config_paths: list[Path]) -> list[dict]:
+    """
+    Load several JSON or YAML configuration files concurrently.
+
+    Files are loaded on a thread pool so that their reads, which release the
+    GIL, overlap. Parsing holds the GIL, so files are still parsed one at a
+    time.
+
+    Args:
+        config_paths (list[str]): The paths to the configuration files.
+
+    Returns:
+        list[dict]: The configuration dictionaries, in the order of the paths.
+    """
+    if not config_paths:
+        return []
+    with ThreadPoolExecutor(max_workers=min(32, len(config_paths))) as executor:
+        return list(executor.map(load_config, config_paths))
 
 
+@functools.lru_cache(maxsize=64)
 def validate_dialect(dialect_name: str) -> bool:
     """
     Validate if the given dialect is supported by sqlglot.
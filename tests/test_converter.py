@@ -1,12 +1,17 @@
 import tempfile
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
+import sqlglot
 
+from sqlecto.converter import _get_transpiler
+from sqlecto.converter import _transpile_one
 from sqlecto.converter import extract_spark_queries
 from sqlecto.converter import extract_sql_queries
 from sqlecto.converter import filter_create_table_queries
+from sqlecto.converter import make_replacer
 from sqlecto.converter import process_file
 from sqlecto.converter import replace_table_names
 from sqlecto.converter import transpile_sql_queries
@@ -58,6 +63,13 @@ def test_filter_create_table_queries():
     assert "CREATE TABLE" not in filtered[1].upper()
 
 
+def test_filter_create_table_queries_whitespace():
+    queries = ["\n  CREATE\n  TABLE t (id INT)", "SELECT 1", "CREATE TABLES_X"]
+
+    filtered = filter_create_table_queries(queries)
+    assert filtered == ["SELECT 1", "CREATE TABLES_X"]
+
+
 def test_extract_spark_queries():
     queries = extract_spark_queries(SAMPLE_SPARK_CODE)
     assert len(queries) == 2
@@ -65,6 +77,12 @@ def test_extract_spark_queries():
     assert "GROUP BY name" in queries[1]
 
 
+def test_extract_spark_queries_single_quotes():
+    code = "spark.sql('''SELECT \"\"\" FROM t''')"
+    queries = extract_spark_queries(code)
+    assert queries == ['SELECT """ FROM t']
+
+
 def test_extract_spark_queries_empty():
     queries = extract_spark_queries("def empty_function(): pass")
     assert len(queries) == 0
@@ -93,18 +111,85 @@ def test_replace_table_names():
     assert "another_new_table" in replaced[1]
 
 
+def test_replace_table_names_whole_identifiers_only():
+    queries = ["SELECT * FROM orders JOIN orders_archive USING (id)"]
+    mappings = [{"src_table": "orders", "dst_table": "sales.orders"}]
+
+    replaced = replace_table_names(queries, mappings)
+    assert replaced == ["SELECT * FROM sales.orders JOIN orders_archive USING (id)"]
+
+
+def test_make_replacer_reused():
+    mappings = [{"src_table": "old_table", "dst_table": "new_table"}]
+
+    replace = make_replacer(mappings)
+    assert replace("SELECT * FROM old_table") == "SELECT * FROM new_table"
+    assert make_replacer([dict(m) for m in mappings]) is replace
+    assert make_replacer([])("SELECT 1") == "SELECT 1"
+
+
 def test_transpile_sql_queries():
     queries = ["SELECT CURRENT_TIMESTAMP()"]  # Spark syntax
     transpiled = transpile_sql_queries(queries, "spark", "snowflake")
     assert "CURRENT_TIMESTAMP" in transpiled[0]  # Snowflake syntax
 
 
+def test_transpile_sql_queries_cached():
+    _transpile_one.cache_clear()
+    queries = ["SELECT CURRENT_TIMESTAMP()"]
+    first = transpile_sql_queries(queries, "spark", "snowflake")
+    second = transpile_sql_queries(queries, "spark", "snowflake")
+    assert first == second
+    assert _transpile_one.cache_info().hits == 1
+
+
 def test_transpile_sql_queries_with_error():
     queries = ["INVALID SQL QUERY"]
     transpiled = transpile_sql_queries(queries, "spark", "snowflake")
     assert transpiled[0].startswith("-- Error transpiling query")
 
 
+def test_transpile_sql_queries_deduplicates(caplog):
+    queries = ["INVALID SQL QUERY", "SELECT 1", "INVALID SQL QUERY"]
+    transpiled = transpile_sql_queries(queries, "spark", "snowflake")
+    assert len(transpiled) == 3
+    assert transpiled[0] == transpiled[2]
+    assert transpiled[1] == "SELECT\n  1"
+    assert sum("Error transpiling" in r.message for r in caplog.records) == 1
+
+
+def test_transpile_sql_queries_thread_safe():
+    queries = [
+        f"SELECT a{i}, CASE WHEN b > {i} THEN 1 ELSE 0 END AS flag "
+        f"FROM t{i} WHERE c = {i} GROUP BY a{i}, flag"
+        for i in range(2000)
+    ]
+    expected = [
+        sqlglot.transpile(query, read="spark", write="snowflake", pretty=True)[0]
+        for query in queries
+    ]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(
+                lambda query: transpile_sql_queries([query], "spark", "snowflake")[0],
+                queries,
+            )
+        )
+
+    assert results == expected
+
+
+def test_tokenizer_not_shared_between_threads():
+    tokenizer = _get_transpiler("spark", "snowflake")[0]
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other = executor.submit(lambda: _get_transpiler("spark", "snowflake")[0])
+
+    assert _get_transpiler("spark", "snowflake")[0] is tokenizer
+    assert other.result() is not tokenizer
+
+
 @pytest.mark.parametrize(
     "file_extension,content", [(".py", SAMPLE_SPARK_CODE), (".sql", SAMPLE_SQL_FILE)]
 )
@@ -126,9 +211,61 @@ def test_process_file(temp_dir, file_extension, content):
     assert content  # File should not be empty
 
 
+def test_process_file_output(temp_dir):
+    test_file = Path(temp_dir) / "queries.sql"
+    test_file.write_text(SAMPLE_SQL_FILE)
+    mappings = [{"src_table": "table1", "dst_table": "new_table1"}]
+
+    output_path = process_file(
+        str(test_file), "spark", "snowflake", mappings, output_dir=temp_dir
+    )
+
+    content = Path(output_path).read_text()
+    assert "new_table1" in content
+    assert "CREATE TABLE" not in content.upper()
+    assert content.count("-" * 80) == 2
+
+
 def test_process_file_invalid_extension(temp_dir):
     invalid_file = Path(temp_dir) / "test.txt"
     invalid_file.write_text("some content")
 
     with pytest.raises(ValueError, match="Unsupported file type"):
         process_file(str(invalid_file), "spark", "snowflake", [], output_dir=temp_dir)
+
+
+@pytest.mark.parametrize("content", [None, b"SELECT 1;\n\nSELECT '\xff';"])
+def test_process_file_failure_leaves_no_output(temp_dir, content):
+    test_file = Path(temp_dir) / "bad.sql"
+    if content is not None:
+        test_file.write_bytes(content)
+    output_file = Path(temp_dir) / "converted_bad.sql"
+
+    with pytest.raises((OSError, UnicodeDecodeError)):
+        process_file(str(test_file), "spark", "snowflake", [], output_dir=temp_dir)
+
+    assert not output_file.exists()
+    assert sorted(p.name for p in Path(temp_dir).iterdir()) == (
+        ["bad.sql"] if content is not None else []
+    )
+
+
+def test_process_file_failure_keeps_previous_output(temp_dir):
+    test_file = Path(temp_dir) / "bad.sql"
+    test_file.write_bytes(b"SELECT '\xff';")
+    output_file = Path(temp_dir) / "converted_bad.sql"
+    output_file.write_text("previous run")
+
+    with pytest.raises(UnicodeDecodeError):
+        process_file(str(test_file), "spark", "snowflake", [], output_dir=temp_dir)
+
+    assert output_file.read_text() == "previous run"
+
+
+def test_process_file_crlf_input(temp_dir):
+    test_file = Path(temp_dir) / "crlf.sql"
+    test_file.write_bytes(b"SELECT a\r\nFROM table1;\r\n\r\nBAD QUERY\r\nHERE;\r\n")
+
+    output_path = process_file(str(test_file), "spark", "snowflake", [], temp_dir)
+
+    assert b"\r" not in Path(output_path).read_bytes()
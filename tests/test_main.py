@@ -13,6 +13,12 @@ from sqlecto.main import parse_table_mapping
 runner = CliRunner()
 
 
+@pytest.fixture(autouse=True)
+def isolated_cwd(tmp_path, monkeypatch):
+    """Run each test from a temporary directory so default outputs stay there."""
+    monkeypatch.chdir(tmp_path)
+
+
 @pytest.fixture
 def temp_dir(tmp_path):
     """Create a temporary directory with some test files."""
@@ -56,6 +62,12 @@ def test_parse_table_mapping():
     assert parse_table_mapping(input_mappings) == expected
 
 
+def test_parse_table_mapping_splits_on_first_colon():
+    assert parse_table_mapping(["table1:catalog:table2"]) == [
+        {"src_table": "table1", "dst_table": "catalog:table2"}
+    ]
+
+
 @patch("sqlecto.main.process_file")
 def test_basic_file_processing(mock_process, temp_dir):
     mock_process.return_value = str(temp_dir / "output.sql")
@@ -301,3 +313,32 @@ def test_invalid_config_file(tmp_path):
     )
     assert result.exit_code != 0
     assert "Invalid config file" in result.stdout
+
+
+def test_parallel_processing(tmp_path):
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    for name in ("first", "second", "third"):
+        (source_dir / f"{name}.sql").write_text("SELECT CURRENT_TIMESTAMP()")
+    output_dir = tmp_path / "out"
+    result = runner.invoke(
+        app,
+        [
+            "--source-dir",
+            str(source_dir),
+            "--source-dialect",
+            "spark",
+            "--target-dialect",
+            "snowflake",
+            "--output-dir",
+            str(output_dir),
+            "--jobs",
+            "2",
+        ],
+    )
+    assert result.exit_code == 0
+    assert sorted(p.name for p in output_dir.iterdir()) == [
+        "converted_first.sql",
+        "converted_second.sql",
+        "converted_third.sql",
+    ]
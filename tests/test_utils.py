@@ -1,12 +1,19 @@
 import json
+import re
+import subprocess
+import sys
 
+from pathlib import Path
 from unittest.mock import mock_open
 from unittest.mock import patch
 
 import pytest
 import yaml
 
+from sqlecto.utils import iter_source_files
+from sqlecto.utils import iter_sql_statements
 from sqlecto.utils import load_config
+from sqlecto.utils import load_configs
 from sqlecto.utils import read_file
 from sqlecto.utils import validate_dialect
 
@@ -15,13 +22,20 @@ class TestReadFile:
     def test_read_file_success(self):
         """Test successful file reading"""
         test_content = "Hello, World!"
-        mock = mock_open(read_data=test_content)
+        mock = mock_open(read_data=test_content.encode("utf-8"))
 
         with patch("builtins.open", mock):
             result = read_file("dummy.txt")
 
         assert result == test_content
-        mock.assert_called_once_with("dummy.txt", encoding="utf-8")
+        mock.assert_called_once_with("dummy.txt", "rb", buffering=0)
+
+    def test_read_file_normalizes_newlines(self, tmp_path):
+        """Test that CRLF and CR line endings are read as LF"""
+        test_file = tmp_path / "crlf.py"
+        test_file.write_bytes(b"a = 1\r\nb = 2\rc = 3\n")
+
+        assert read_file(test_file) == "a = 1\nb = 2\nc = 3\n"
 
     def test_read_file_file_not_found(self):
         """Test behavior when file is not found"""
@@ -29,6 +43,78 @@ class TestReadFile:
             read_file("nonexistent.txt")
 
 
+class TestIterSqlStatements:
+    def test_iter_sql_statements(self, tmp_path):
+        """Test splitting a SQL file into statements"""
+        sql_file = tmp_path / "queries.sql"
+        sql_file.write_text(
+            "SELECT 1;\n\n  SELECT 'é' ;;\nSELECT 3\n", encoding="utf-8"
+        )
+
+        result = list(iter_sql_statements(sql_file))
+
+        assert result == ["SELECT 1", "SELECT 'é'", "SELECT 3"]
+
+    def test_iter_sql_statements_exclude(self, tmp_path):
+        """Test skipping statements matching the exclude pattern"""
+        sql_file = tmp_path / "queries.sql"
+        sql_file.write_text(
+            "CREATE TABLE t (id INT);\n create table u AS SELECT 1; SELECT 2"
+        )
+
+        result = list(
+            iter_sql_statements(sql_file, exclude=re.compile(rb"\s*CREATE TABLE", re.I))
+        )
+
+        assert result == ["SELECT 2"]
+
+    def test_iter_sql_statements_normalizes_newlines(self, tmp_path):
+        """Test that CRLF line endings are yielded as LF"""
+        sql_file = tmp_path / "crlf.sql"
+        sql_file.write_bytes(b"SELECT a\r\nFROM t;\r\n\r\nBAD QUERY\r\nHERE;\r\n")
+
+        result = list(iter_sql_statements(sql_file))
+
+        assert result == ["SELECT a\nFROM t", "BAD QUERY\nHERE"]
+
+    def test_iter_sql_statements_empty_file(self, tmp_path):
+        """Test that an empty file yields no statements"""
+        sql_file = tmp_path / "empty.sql"
+        sql_file.write_text("")
+
+        assert list(iter_sql_statements(sql_file)) == []
+
+
+class TestIterSourceFiles:
+    def test_iter_source_files(self, tmp_path):
+        """Test recursive discovery of SQL and Python files"""
+        nested = tmp_path / "nested"
+        nested.mkdir()
+        (tmp_path / "query.sql").write_text("SELECT 1")
+        (tmp_path / "notes.txt").write_text("not sql")
+        (nested / "job.py").write_text("pass")
+
+        result = list(iter_source_files(str(tmp_path)))
+
+        assert result == [str(tmp_path / "query.sql"), str(nested / "job.py")]
+
+    def test_iter_source_files_skips_directory_symlinks(self, tmp_path):
+        """Test that symlinked directories are neither yielded nor followed"""
+        target = tmp_path / "target"
+        target.mkdir()
+        (target / "query.sql").write_text("SELECT 1")
+        (tmp_path / "link.sql").symlink_to(target, target_is_directory=True)
+        (tmp_path / "link").symlink_to(target, target_is_directory=True)
+
+        result = list(iter_source_files(str(tmp_path)))
+
+        assert result == [str(target / "query.sql")]
+
+    def test_iter_source_files_missing_directory(self, tmp_path):
+        """Test that unreadable directories are skipped"""
+        assert list(iter_source_files(str(tmp_path / "missing"))) == []
+
+
 class TestLoadConfig:
     @pytest.fixture
     def json_config(self):
@@ -38,41 +124,126 @@ class TestLoadConfig:
     def yaml_config(self):
         return {"name": "test", "value": 123}
 
-    def test_load_json_config(self, json_config):
+    def test_load_json_config(self, json_config, tmp_path):
         """Test loading JSON configuration"""
-        mock = mock_open(read_data=json.dumps(json_config))
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps(json_config))
 
-        with patch("builtins.open", mock):
-            result = load_config("config.json")
+        result = load_config(str(config_file))
 
         assert result == json_config
-        mock.assert_called_once_with("config.json", encoding="utf-8")
 
-    def test_load_yaml_config(self, yaml_config):
+    def test_load_yaml_config(self, yaml_config, tmp_path):
         """Test loading YAML configuration"""
-        yaml_content = yaml.dump(yaml_config)
-        mock = mock_open(read_data=yaml_content)
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(yaml.dump(yaml_config))
 
-        with patch("builtins.open", mock):
-            result = load_config("config.yaml")
+        result = load_config(str(config_file))
 
         assert result == yaml_config
-        mock.assert_called_once_with("config.yaml", encoding="utf-8")
 
-    def test_load_yml_config(self, yaml_config):
+    def test_load_yml_config(self, yaml_config, tmp_path):
         """Test loading .yml configuration"""
-        yaml_content = yaml.dump(yaml_config)
-        mock = mock_open(read_data=yaml_content)
+        config_file = tmp_path / "config.yml"
+        config_file.write_text(yaml.dump(yaml_config))
 
-        with patch("builtins.open", mock):
-            result = load_config("config.yml")
+        result = load_config(str(config_file))
 
         assert result == yaml_config
-        mock.assert_called_once_with("config.yml", encoding="utf-8")
+
+    @pytest.mark.skipif(
+        not yaml.__with_libyaml__, reason="PyYAML is built without libyaml"
+    )
+    def test_load_yaml_config_uses_libyaml(self, yaml_config):
+        """Test that YAML is parsed with the libyaml-backed loader"""
+        mock = mock_open(read_data=yaml.dump(yaml_config).encode("utf-8"))
+        load_spy = patch.object(yaml, "load", wraps=yaml.load)
+
+        with patch("builtins.open", mock), load_spy as load:
+            load_config("config.yaml")
+
+        assert issubclass(load.call_args.kwargs["Loader"], yaml.CSafeLoader)
+
+    def test_load_yaml_config_interns_strings(self, tmp_path):
+        """Test that short YAML strings are shared across documents"""
+        first_file = tmp_path / "first.yaml"
+        first_file.write_text("table_mappings:\n  - src_table: orders\n")
+        second_file = tmp_path / "second.yaml"
+        second_file.write_text("table_mappings:\n  - src_table: orders\n")
+
+        first = load_config(first_file)["table_mappings"][0]
+        second = load_config(second_file)["table_mappings"][0]
+
+        assert first["src_table"] is second["src_table"]
+        assert next(iter(first)) is next(iter(second))
+
+    def test_load_json_shaped_yaml_config(self, tmp_path):
+        """Test that JSON-shaped YAML keeps PyYAML's YAML 1.1 semantics"""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text('{"a": 1e3, "b": 1.5e3, "c": 123}')
+
+        assert load_config(config_file) == {"a": "1e3", "b": "1.5e3", "c": 123}
+
+    def test_load_yaml_flow_mapping_config(self, tmp_path):
+        """Test that YAML flow mappings that are not JSON still parse"""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("{name: test, value: 123}")
+
+        assert load_config(config_file) == {"name": "test", "value": 123}
+
+    def test_load_config_cached(self, tmp_path):
+        """Test that an unchanged config file is only parsed once"""
+        config_file = tmp_path / "config.json"
+        config_file.write_text('{"name": "test"}')
+
+        first = load_config(config_file)
+        with patch("builtins.open", side_effect=AssertionError("file re-read")):
+            second = load_config(config_file)
+
+        assert second == first
+
+        config_file.write_text('{"name": "changed"}')
+        changed = load_config(config_file)
+        assert changed == {"name": "changed"}
+
+        load_config.cache_clear()
+        reread = patch("builtins.open", side_effect=AssertionError("file re-read"))
+        with reread, pytest.raises(AssertionError, match="file re-read"):
+            load_config(config_file)
+
+    def test_load_config_cached_returns_copies(self, tmp_path):
+        """Test that mutating a loaded config does not leak into later loads"""
+        config_file = tmp_path / "config.json"
+        config_file.write_text('{"table_mappings": [{"src_table": "a"}]}')
+
+        first = load_config(config_file)
+        first["table_mappings"][0]["src_table"] = "mutated"
+        first.setdefault("extra", True)
+
+        assert load_config(config_file) == {"table_mappings": [{"src_table": "a"}]}
+
+    def test_load_json_config_does_not_import_yaml(self, tmp_path):
+        """Test that loading a JSON config leaves PyYAML unimported"""
+        config_file = tmp_path / "config.json"
+        config_file.write_text('{"name": "test"}')
+        code = (
+            "import sys; from sqlecto.utils import load_config; "
+            "load_config(sys.argv[1]); print('yaml' in sys.modules)"
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-c", code, str(config_file)],
+            cwd=Path(__file__).parents[1],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.strip() == "False"
 
     def test_load_config_unsupported_extension(self):
         """Test loading config with unsupported file extension"""
-        mock = mock_open(read_data="some content")
+        mock = mock_open(read_data=b"some content")
 
         with patch("builtins.open", mock), pytest.raises(ValueError) as exc_info:
             load_config("config.txt")
@@ -87,65 +258,116 @@ class TestLoadConfig:
     def test_load_config_invalid_json(self):
         """Test behavior with invalid JSON content"""
         invalid_json = "{ invalid json }"
-        mock = mock_open(read_data=invalid_json)
+        mock = mock_open(read_data=invalid_json.encode("utf-8"))
 
         with patch("builtins.open", mock), pytest.raises(json.JSONDecodeError):
             load_config("config.json")
 
+    @pytest.mark.parametrize("backend", ["json", "orjson"])
+    def test_load_config_invalid_json_backends(self, backend):
+        """Test that every JSON backend raises json.JSONDecodeError"""
+        loads = pytest.importorskip(backend).loads
+        open_patch = patch("builtins.open", mock_open(read_data=b"{ invalid json }"))
+        backend_patch = patch("sqlecto.utils.json_loads", loads)
+
+        with open_patch, backend_patch, pytest.raises(json.JSONDecodeError):
+            load_config("config.json")
+
     def test_load_config_invalid_yaml(self):
         """Test behavior with invalid YAML content"""
         invalid_yaml = ": invalid: yaml: content"
-        mock = mock_open(read_data=invalid_yaml)
+        mock = mock_open(read_data=invalid_yaml.encode("utf-8"))
 
         with patch("builtins.open", mock), pytest.raises(yaml.YAMLError):
             load_config("config.yaml")
 
 
+class TestLoadConfigs:
+    def test_load_configs(self, tmp_path):
+        """Test loading several configuration files at once"""
+        paths = []
+        for index in range(5):
+            path = tmp_path / f"config_{index}.json"
+            path.write_text(json.dumps({"value": index}))
+            paths.append(path)
+        yaml_path = tmp_path / "config.yaml"
+        yaml_path.write_text("value: yaml")
+        paths.append(yaml_path)
+
+        result = load_configs(paths)
+
+        assert result == [{"value": index} for index in range(5)] + [{"value": "yaml"}]
+
+    def test_load_configs_empty(self):
+        """Test loading an empty list of configuration files"""
+        assert load_configs([]) == []
+
+    def test_load_configs_error(self, tmp_path):
+        """Test that a failing file raises its error"""
+        with pytest.raises(FileNotFoundError):
+            load_configs([tmp_path / "missing.json"])
+
+
+VALIDATE_DIALECT_CASES = [
+    ("postgres", True),
+    ("mysql", True),
+    ("sqlite", True),
+    ("invalid_dialect", False),
+    ("", True),
+    ("POSTGRES", True),  # Test case insensitivity
+]
+
+
 class TestValidateDialect:
-    @pytest.mark.parametrize(
-        "dialect,expected",
-        [
-            ("postgres", True),
-            ("mysql", True),
-            ("sqlite", True),
-            ("invalid_dialect", False),
-            ("", True),
-            ("POSTGRES", True),  # Test case insensitivity
-        ],
-    )
-    def test_validate_dialect(self, dialect, expected):
+    def test_validate_dialect(self):
         """Test dialect validation with various inputs"""
-        assert validate_dialect(dialect) == expected
+        for dialect, expected in VALIDATE_DIALECT_CASES:
+            assert validate_dialect(dialect) == expected, dialect
 
     def test_validate_dialect_none_input(self):
         """Test dialect validation with None input"""
         with pytest.raises(AttributeError):
             validate_dialect(None)
 
+    def test_validate_dialect_cached(self):
+        """Test that repeated validations are served from the cache"""
+        validate_dialect.cache_clear()
+
+        assert validate_dialect("snowflake") is True
+        assert validate_dialect("snowflake") is True
+
+        assert validate_dialect.cache_info().hits == 1
+
+    def test_validate_dialect_none_input_not_cached(self):
+        """Test that errors are raised again instead of being cached"""
+        for _ in range(2):
+            with pytest.raises(AttributeError):
+                validate_dialect(None)
+
 
-def test_integration_json_workflow():
+def test_integration_json_workflow(tmp_path):
     """Integration test for reading and loading JSON config"""
     config_content = '{"name": "test", "value": 123}'
-    mock = mock_open(read_data=config_content)
+    config_file = tmp_path / "config.json"
+    config_file.write_text(config_content)
 
-    with patch("builtins.open", mock):
-        # Test both reading and loading
-        raw_content = read_file("config.json")
-        config = load_config("config.json")
+    # Test both reading and loading
+    raw_content = read_file(str(config_file))
+    config = load_config(str(config_file))
 
     assert raw_content == config_content
     assert config == {"name": "test", "value": 123}
 
 
-def test_integration_yaml_workflow():
+def test_integration_yaml_workflow(tmp_path):
     """Integration test for reading and loading YAML config"""
     config_content = "name: test\nvalue: 123"
-    mock = mock_open(read_data=config_content)
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(config_content)
 
-    with patch("builtins.open", mock):
-        # Test both reading and loading
-        raw_content = read_file("config.yaml")
-        config = load_config("config.yaml")
+    # Test both reading and loading
+    raw_content = read_file(str(config_file))
+    config = load_config(str(config_file))
 
     assert raw_content == config_content
     assert config == {"name": "test", "value": 123}